@@ -2,34 +2,88 @@ import os
 import json
 import datetime
 import re  # Ensure this import exists
+import time
+import argparse
+import subprocess
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache, partial
+from typing import Optional
 from dotenv import load_dotenv
-import assemblyai as aai
-from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import InstalledAppFlow
-from google.auth.transport.requests import Request
-from googleapiclient.discovery import build
-import pytz  # For timezone handling
-import dateparser  # For parsing natural language dates
-
-# Load environment variables from .env file
-load_dotenv()
+# assemblyai, the Google auth libraries, httpx and dateparser are slow to import, so they
+# are imported where they are first used instead of here
+try:
+    import orjson  # Faster JSON serialization, used when installed
+except ImportError:
+    orjson = None
+import transcript_cache
+
+@dataclass(frozen=True)
+class Config:
+    """Settings read from the environment and the .env file."""
+    assemblyai_api_key: Optional[str]
+    google_client_secret_file: Optional[str]
+
+@lru_cache(maxsize=None)
+def cfg():
+    """
+    Loads the settings on first use. Each one is only checked by the code that needs it,
+    so for example transcribing from the cache works without any API keys set.
+    """
+    # Load environment variables from .env file
+    load_dotenv()
+    return Config(
+        assemblyai_api_key=os.getenv("ASSEMBLYAI_API_KEY"),
+        google_client_secret_file=os.getenv("GOOGLE_CLIENT_SECRET_FILE"),
+    )
 
 # AssemblyAI Setup
-ASSEMBLYAI_API_KEY = os.getenv("ASSEMBLYAI_API_KEY")
-if not ASSEMBLYAI_API_KEY:
-    raise ValueError("AssemblyAI API key not set. Please check your .env file.")
-
-aai.settings.api_key = ASSEMBLYAI_API_KEY
-transcriber = aai.Transcriber()
+_transcriber = None
+_transcriber_lock = threading.Lock()
+# Network hiccups while uploading/polling are retried with a linear backoff
+TRANSCRIBE_ATTEMPTS = 3
+# Playback speed used by --speedup; AssemblyAI bills per audio minute
+SPEEDUP_FACTOR = 1.5
+# One lock per sped-up cache key, so identical audio is only encoded once at a time
+_speedup_locks = {}
+_speedup_locks_lock = threading.Lock()
 
 # Google Calendar API Setup
 SCOPES = ['https://www.googleapis.com/auth/calendar']
-GOOGLE_CLIENT_SECRET_FILE = os.getenv("GOOGLE_CLIENT_SECRET_FILE")
-if not GOOGLE_CLIENT_SECRET_FILE:
-    raise ValueError("Google client secret file path not set. Please check your .env file.")
+CALENDAR_EVENTS_URL = 'https://www.googleapis.com/calendar/v3/calendars/primary/events'
+
+def _bearer_auth(creds):
+    """
+    Return an httpx auth flow that sends the OAuth token. Like google-auth's AuthorizedSession,
+    it refreshes the token once it expires, and also refreshes and resends once on a 401.
+    """
+    import httpx
+    from google.auth.transport.requests import Request
+
+    class GoogleBearerAuth(httpx.Auth):
+        def auth_flow(self, request):
+            if not creds.valid:
+                creds.refresh(Request())
+            request.headers['Authorization'] = f"Bearer {creds.token}"
+            response = yield request
+            # The server can reject a token that still looks valid locally (revoked,
+            # clock skew, or no expiry recorded in token.json)
+            if response.status_code == 401:
+                creds.refresh(Request())
+                request.headers['Authorization'] = f"Bearer {creds.token}"
+                yield request
+
+    return GoogleBearerAuth()
 
 def authenticate_google_calendar():
-    """Authenticate and return the Google Calendar service."""
+    """Authenticate and return an HTTP client for the Google Calendar API."""
+    import httpx
+    from google.oauth2.credentials import Credentials
+    from google_auth_oauthlib.flow import InstalledAppFlow
+    from google.auth.transport.requests import Request
+
     creds = None
     # Token file stores the user's access and refresh tokens
     if os.path.exists('token.json'):
@@ -39,25 +93,128 @@ def authenticate_google_calendar():
         if creds and creds.expired and creds.refresh_token:
             creds.refresh(Request())
         else:
+            client_secret_file = cfg().google_client_secret_file
+            if not client_secret_file:
+                raise ValueError("Google client secret file path not set. Please check your .env file.")
             flow = InstalledAppFlow.from_client_secrets_file(
-                GOOGLE_CLIENT_SECRET_FILE, SCOPES
+                client_secret_file, SCOPES
             )
             creds = flow.run_local_server(port=8080)
         # Save the credentials for next time
         with open('token.json', 'w') as token:
             token.write(creds.to_json())
 
-    service = build('calendar', 'v3', credentials=creds)
-    return service
+    # Only two REST endpoints are used, so calling them directly avoids loading the
+    # discovery document and building the full googleapiclient service
+    return httpx.Client(auth=_bearer_auth(creds), timeout=30)
+
+_client = None
+
+def get_calendar_client():
+    """Return the Google Calendar client, authenticating only on first use."""
+    global _client
+    if _client is None:
+        _client = authenticate_google_calendar()
+    return _client
 
-def transcribe_audio(audio_file_path):
+def get_transcriber():
     """
-    Transcribes an audio file from a local path using AssemblyAI.
+    Returns the AssemblyAI transcriber, importing and configuring the SDK on first use.
+    """
+    global _transcriber
+    # Upload worker threads may ask for it at the same time
+    with _transcriber_lock:
+        if _transcriber is None:
+            api_key = cfg().assemblyai_api_key
+            if not api_key:
+                raise ValueError("AssemblyAI API key not set. Please check your .env file.")
+            import assemblyai as aai
+            aai.settings.api_key = api_key
+            _transcriber = aai.Transcriber()
+    return _transcriber
+
+def _is_transient(error):
+    """
+    Returns True for errors that may succeed on a retry: connection problems, timeouts and
+    rate-limit or server-side HTTP responses.
+    """
+    import httpx
+
+    if isinstance(error, httpx.TransportError):
+        return True
+    # The AssemblyAI SDK raises TranscriptError with the HTTP status on the error itself;
+    # plain httpx errors carry it on their response
+    status_code = getattr(error, 'status_code', None)
+    if status_code is None:
+        status_code = getattr(getattr(error, 'response', None), 'status_code', None)
+    return status_code == 429 or (status_code is not None and status_code >= 500)
+
+def _with_retries(func, *args):
+    """
+    Calls func, retrying transient network errors with a linear backoff. Any other error
+    (a missing file, a rejected API key, ...) is raised straight away.
+    """
+    for attempt in range(TRANSCRIBE_ATTEMPTS):
+        try:
+            return func(*args)
+        except Exception as e:
+            if attempt == TRANSCRIBE_ATTEMPTS - 1 or not _is_transient(e):
+                raise
+            print(f"Transcription attempt {attempt + 1} failed: {e}. Retrying...")
+            time.sleep(1.0 * (attempt + 1))
+
+def speed_up_audio(audio_file_path, speedup):
+    """
+    Re-encodes an audio file at a faster playback speed with ffmpeg, so there are fewer
+    minutes to transcribe. The result is cached by content and reused for identical audio.
+    """
+    extension = os.path.splitext(audio_file_path)[1] or '.wav'
+    key = transcript_cache.make_key(audio_file_path, speedup)
+    sped_path = transcript_cache.entry_path(key, extension)
+    # Upload workers may be handed files with identical content; only one of them encodes it
+    with _speedup_locks_lock:
+        key_lock = _speedup_locks.setdefault(key, threading.Lock())
+    with key_lock:
+        if not os.path.exists(sped_path):
+            os.makedirs(transcript_cache.CACHE_DIR, exist_ok=True)
+            # Encode to a unique temporary file first so a failed or interrupted encode never
+            # leaves a truncated file behind, in the cache or next to it
+            fd, tmp_path = tempfile.mkstemp(dir=transcript_cache.CACHE_DIR, suffix=extension)
+            os.close(fd)
+            try:
+                subprocess.run(
+                    ["ffmpeg", "-y", "-loglevel", "error", "-i", audio_file_path,
+                     "-filter:a", f"atempo={speedup}", "-vn", tmp_path],
+                    check=True
+                )
+                os.replace(tmp_path, sped_path)
+            except BaseException:
+                os.remove(tmp_path)
+                raise
+    return sped_path
+
+def submit_audio(audio_file_path, speedup=None):
+    """
+    Uploads a local audio file and queues it for transcription without waiting for the result.
+    If speedup is given, the audio is sped up by that factor before uploading.
     """
     try:
-        print("Transcribing audio...")
-        transcript = transcriber.transcribe(audio_file_path)
-        transcript = transcript.wait_for_completion()
+        if speedup:
+            audio_file_path = speed_up_audio(audio_file_path, speedup)
+        print(f"Uploading {audio_file_path}...")
+        return _with_retries(get_transcriber().submit, audio_file_path)
+    except Exception as e:
+        print(f"Transcription error: {e}")
+        return None
+
+def wait_for_transcript(transcript):
+    """
+    Polls a queued transcript until AssemblyAI has finished processing it.
+    """
+    import assemblyai as aai
+
+    try:
+        transcript = _with_retries(transcript.wait_for_completion)
         if transcript.status == aai.TranscriptStatus.error:
             print(f"Transcription failed: {transcript.error}")
             return None
@@ -66,18 +223,104 @@ def transcribe_audio(audio_file_path):
         print(f"Transcription error: {e}")
         return None
 
+def _cached_transcript(cache_key):
+    cached = transcript_cache.get(cache_key)
+    if isinstance(cached, dict) and isinstance(cached.get("text"), str):
+        return cached["text"]
+    return None
+
+def iter_transcripts(audio_file_paths, use_cache=True, max_workers=8, speedup=None):
+    """
+    Transcribes several audio files using AssemblyAI and yields (path, transcript text) pairs in
+    input order, with None as the text for any file that failed. Every file is submitted up front,
+    then each pair is yielded once that file is done, so a slow file holds back the ones after it.
+    Results are cached by each file's contents, so re-running on the same audio skips the API call.
+    """
+    cache_keys = [None] * len(audio_file_paths)
+    cached_texts = [None] * len(audio_file_paths)
+    to_submit = []
+    for i, audio_file_path in enumerate(audio_file_paths):
+        if use_cache:
+            try:
+                cache_keys[i] = transcript_cache.make_key(audio_file_path, speedup)
+            except OSError as e:
+                print(f"Transcription error: {e}")
+                continue
+            cached_texts[i] = _cached_transcript(cache_keys[i])
+            if cached_texts[i] is not None:
+                print(f"Using cached transcript for {audio_file_path}")
+                continue
+        to_submit.append(i)
+
+    # Uploading is the only step that needs local threads. Once a job is queued
+    # AssemblyAI processes it remotely, so a single thread can poll every job in
+    # turn and the total time is still about that of the slowest file.
+    if to_submit:
+        # Fails fast on a missing API key instead of once per upload
+        get_transcriber()
+        print("Transcribing audio...")
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        uploads = executor.map(partial(submit_audio, speedup=speedup), [audio_file_paths[i] for i in to_submit])
+        submitted = dict(zip(to_submit, uploads))
+
+    # Yielding each transcript as soon as it is ready lets the caller work on it
+    # (e.g. ask the user follow-up questions) while the later files are still processing.
+    for i, audio_file_path in enumerate(audio_file_paths):
+        if i not in submitted:
+            yield audio_file_path, cached_texts[i]
+            continue
+        transcript = wait_for_transcript(submitted[i]) if submitted[i] else None
+        if not transcript:
+            yield audio_file_path, None
+            continue
+        if cache_keys[i]:
+            try:
+                transcript_cache.put(cache_keys[i], {"id": transcript.id, "text": transcript.text})
+            except OSError as e:
+                print(f"Could not cache transcript: {e}")
+        yield audio_file_path, transcript.text
+
+def transcribe_audio_files(audio_file_paths, use_cache=True, max_workers=8, speedup=None):
+    """
+    Transcribes several audio files and returns their transcript texts in the same order as the
+    input paths, with None for any file that failed.
+    """
+    return [text for _, text in iter_transcripts(audio_file_paths, use_cache, max_workers, speedup)]
+
+def transcribe_audio(audio_file_path, use_cache=True, speedup=None):
+    """
+    Transcribes an audio file from a local path using AssemblyAI and returns the transcript text.
+    """
+    return transcribe_audio_files([audio_file_path], use_cache=use_cache, speedup=speedup)[0]
+
+@lru_cache(maxsize=512)
+def _parse_natural_time(normalized_time_str):
+    import dateparser  # For parsing natural language dates
+
+    return dateparser.parse(normalized_time_str, settings={'RETURN_AS_TIMEZONE_AWARE': True})
+
+def parse_natural_time(time_str):
+    """
+    Parses a natural language date/time with dateparser. Results are reused for text
+    already seen in this run, ignoring differences in case and whitespace.
+    """
+    return _parse_natural_time(" ".join(time_str.lower().split()))
+
+# Compiled once instead of on every extraction
+_MEETING_RE = re.compile(r"schedule a meeting with (.+?) at (.+?)(?:\.|$)", re.IGNORECASE)
+
 def extract_task_details(transcript_text):
     """
     Extracts structured task details (task, with_whom, time) from transcript using basic parsing.
     """
     # Simple regex-based extraction
     try:
-        task = re.search(r"schedule a meeting with (.+?) at (.+?)(?:\.|$)", transcript_text, re.IGNORECASE)
+        task = _MEETING_RE.search(transcript_text)
         if task:
             with_whom = task.group(1).strip()
             time_str = task.group(2).strip()
             # Convert to ISO format with timezone (assuming local timezone)
-            time_parsed = dateparser.parse(time_str, settings={'RETURN_AS_TIMEZONE_AWARE': True})
+            time_parsed = parse_natural_time(time_str)
             if not time_parsed:
                 print("Failed to parse time.")
                 return {}
@@ -94,74 +337,80 @@ def extract_task_details(transcript_text):
         print(f"Error extracting task details: {e}")
         return {}
 
+# Questions for each event field, in the order they are asked. Built once at import
+# rather than on every call.
+FOLLOW_UP_QUESTIONS = {
+    "task": {
+        "question": "1. **Event Title**\nPlease provide a clear and concise title for the event (e.g., 'Team Meeting', 'Client Call').",
+        "mandatory": True
+    },
+    "date_time": {
+        "question": "2. **Date & Time**\nPlease specify the date and time for the event (e.g., 'December 7, 2024, 3:00 PM EST').",
+        "mandatory": True
+    },
+    "location": {
+        "question": "3. **Location**\nPlease provide the location of the event. If it's virtual, include the meeting link and access details.",
+        "mandatory": False
+    },
+    "description": {
+        "question": "4. **Description**\nProvide a brief description of the event’s purpose, agenda, or goals.",
+        "mandatory": False
+    },
+    "participants": {
+        "question": "5. **Participants/Attendees**\nList who is invited to the event, including names and roles.",
+        "mandatory": False
+    },
+    "attachments": {
+        "question": "6. **Attachments/Links**\nInclude any necessary files or links to relevant resources (e.g., project files, articles).",
+        "mandatory": False
+    },
+    "recurrence": {
+        "question": "7. **Recurrence**\nWill this event repeat? If yes, specify the pattern (daily, weekly, monthly, etc.) and any exceptions.",
+        "mandatory": False
+    },
+    "notes": {
+        "question": "8. **Notes/Additional Information**\nAny additional details, such as parking information, special instructions, or pre-event preparation.",
+        "mandatory": False
+    },
+    "rsvp": {
+        "question": "9. **Action Items/RSVP Requests**\nDoes the event require attendees to RSVP or complete specific tasks beforehand? If yes, provide instructions.",
+        "mandatory": False
+    }
+}
+
 def ask_follow_up_questions(task_details):
     """
     Identifies missing fields and asks the user for additional details.
     """
-    required_fields = {
-        "task": {
-            "question": "1. **Event Title**\nPlease provide a clear and concise title for the event (e.g., 'Team Meeting', 'Client Call').",
-            "mandatory": True
-        },
-        "date_time": {
-            "question": "2. **Date & Time**\nPlease specify the date and time for the event (e.g., 'December 7, 2024, 3:00 PM EST').",
-            "mandatory": True
-        },
-        "location": {
-            "question": "3. **Location**\nPlease provide the location of the event. If it's virtual, include the meeting link and access details.",
-            "mandatory": False
-        },
-        "description": {
-            "question": "4. **Description**\nProvide a brief description of the event’s purpose, agenda, or goals.",
-            "mandatory": False
-        },
-        "participants": {
-            "question": "5. **Participants/Attendees**\nList who is invited to the event, including names and roles.",
-            "mandatory": False
-        },
-        "attachments": {
-            "question": "6. **Attachments/Links**\nInclude any necessary files or links to relevant resources (e.g., project files, articles).",
-            "mandatory": False
-        },
-        "recurrence": {
-            "question": "7. **Recurrence**\nWill this event repeat? If yes, specify the pattern (daily, weekly, monthly, etc.) and any exceptions.",
-            "mandatory": False
-        },
-        "notes": {
-            "question": "8. **Notes/Additional Information**\nAny additional details, such as parking information, special instructions, or pre-event preparation.",
-            "mandatory": False
-        },
-        "rsvp": {
-            "question": "9. **Action Items/RSVP Requests**\nDoes the event require attendees to RSVP or complete specific tasks beforehand? If yes, provide instructions.",
-            "mandatory": False
-        }
-    }
-
     print("\nTo create a detailed calendar event, please provide additional information where needed.\n")
 
-    for field, details in required_fields.items():
+    for field, details in FOLLOW_UP_QUESTIONS.items():
         # If the field is already present and not empty, skip
         if field in task_details and task_details[field]:
             continue
         # Ask the question
         response = input(details["question"] + "\nYour Answer: ").strip()
+        # Re-ask if the field is mandatory and not provided
+        while not response and details["mandatory"]:
+            response = input("This field is mandatory. " + details["question"] + "\nYour Answer: ").strip()
         if response:
             task_details[field] = response
-        elif details["mandatory"]:
-            # Re-ask if the field is mandatory and not provided
-            while not response and details["mandatory"]:
-                response = input("This field is mandatory. " + details["question"] + "\nYour Answer: ").strip()
-                if response:
-                    task_details[field] = response
-                    break
     return task_details
 
 def parse_time(time_str):
     """
     Parses time string into a timezone-aware datetime object.
     """
+    # Extracted times are already ISO 8601 with an offset, which the standard library
+    # parses directly without going through dateparser's natural language heuristics
+    try:
+        dt = datetime.datetime.fromisoformat(time_str)
+        if dt.tzinfo:
+            return dt
+    except ValueError:
+        pass
     try:
-        dt = dateparser.parse(time_str, settings={'RETURN_AS_TIMEZONE_AWARE': True})
+        dt = parse_natural_time(time_str)
         if not dt:
             raise ValueError("Unable to parse the provided date and time.")
         return dt
@@ -169,9 +418,10 @@ def parse_time(time_str):
         print(f"Time parsing error: {e}")
         raise
 
-def create_calendar_event(service, task_details):
+def build_calendar_event(task_details):
     """
-    Constructs and adds a detailed calendar event to Google Calendar.
+    Constructs a detailed Google Calendar event body from the task details.
+    Returns None if the event cannot be built.
     """
     try:
         # Extract and validate required fields
@@ -179,12 +429,14 @@ def create_calendar_event(service, task_details):
         date_time_str = task_details.get("date_time", None)
         if not date_time_str:
             print("Event date and time not provided.")
-            return
+            return None
 
         # Parse date and time with timezone
         start_time = parse_time(date_time_str)
         # Assuming a default duration of 1 hour if end time not provided
         end_time = start_time + datetime.timedelta(hours=1)
+        # Start and end share the same tzinfo, so its name only needs computing once
+        time_zone = str(start_time.tzinfo) if start_time.tzinfo else 'UTC'
 
         # Prepare the event dictionary
         event = {
@@ -192,11 +444,11 @@ def create_calendar_event(service, task_details):
             'description': task_details.get("description", ""),
             'start': {
                 'dateTime': start_time.isoformat(),
-                'timeZone': str(start_time.tzinfo) if start_time.tzinfo else 'UTC',
+                'timeZone': time_zone,
             },
             'end': {
                 'dateTime': end_time.isoformat(),
-                'timeZone': str(end_time.tzinfo) if end_time.tzinfo else 'UTC',
+                'timeZone': time_zone,
             },
             'location': task_details.get("location", ""),
             'attendees': [],
@@ -213,7 +465,7 @@ def create_calendar_event(service, task_details):
         participants = task_details.get("participants", "")
         if participants:
             # Assuming participants are comma-separated emails or names
-            attendees = [{"email": email.strip()} for email in participants.split(",") if "@" in email]
+            attendees = [{"email": email} for entry in participants.split(",") if "@" in (email := entry.strip())]
             # If emails are not provided, skip adding attendees
             if attendees:
                 event['attendees'] = attendees
@@ -242,75 +494,133 @@ def create_calendar_event(service, task_details):
         if rsvp:
             event['description'] += f"\nRSVP: {rsvp}"
 
-        # Insert the event into Google Calendar
-        created_event = service.events().insert(calendarId='primary', body=event).execute()
-        print(f"\nEvent created successfully: {created_event.get('htmlLink')}")
+        return event
+    except Exception as e:
+        print(f"Error preparing calendar event: {e}")
+        return None
+
+def insert_calendar_event(client, event):
+    """
+    Adds a single event body to Google Calendar.
+    """
+    try:
+        response = client.post(CALENDAR_EVENTS_URL, json=event)
+        response.raise_for_status()
+        print(f"\nEvent created successfully: {response.json().get('htmlLink')}")
     except Exception as e:
         print(f"Error adding event to calendar: {e}")
 
-def display_upcoming_events(service, max_results=10):
+def add_events_to_calendar(client, task_details_list, max_workers=8):
+    """
+    Adds calendar events for all task details to Google Calendar.
+    """
+    events = [event for event in map(build_calendar_event, task_details_list) if event]
+    # The inserts share the client's pooled connections and are sent concurrently,
+    # so adding N events costs about one round-trip instead of N
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        list(executor.map(partial(insert_calendar_event, client), events))
+
+def display_upcoming_events(client, max_results=10):
     """
     Displays upcoming events from Google Calendar.
     """
     try:
         print("\nYour Upcoming Events:")
         now = datetime.datetime.now(datetime.timezone.utc).isoformat()
-        events_result = service.events().list(
-            calendarId='primary',
-            timeMin=now,
-            maxResults=max_results,
-            singleEvents=True,
-            orderBy='startTime'
-        ).execute()
-        events = events_result.get('items', [])
+        response = client.get(CALENDAR_EVENTS_URL, params={
+            'timeMin': now,
+            'maxResults': max_results,
+            'singleEvents': 'true',
+            'orderBy': 'startTime'
+        })
+        response.raise_for_status()
+        events = response.json().get('items', [])
 
         if not events:
             print("No upcoming events found.")
             return
 
+        # Build the whole listing first so it is written out in a single call
+        lines = []
         for event in events:
             start = event['start'].get('dateTime', event['start'].get('date'))
             summary = event.get('summary', 'No Title')
-            print(f"- {summary} at {start}")
+            lines.append(f"- {summary} at {start}")
+        print("\n".join(lines))
     except Exception as e:
         print(f"Error fetching upcoming events: {e}")
 
-def main(audio_file_path):
-    # Step 1: Transcribe audio
-    transcript_obj = transcribe_audio(audio_file_path)
-    if not transcript_obj:
-        print("Failed to transcribe audio.")
-        return
+def format_json(data):
+    """
+    Pretty-prints data as indented JSON.
+    """
+    if orjson:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2).decode()
+    return json.dumps(data, indent=2)
 
-    transcript_text = transcript_obj.text
+def process_transcript(transcript_text, interactive=True):
+    """
+    Turns a completed transcript into the task details for a calendar event.
+    In non-interactive mode the extracted details are used as-is.
+    """
     print(f"\nTranscript:\n{transcript_text}")
 
     # Step 2: Extract task details using basic parsing
     task_details = extract_task_details(transcript_text)
     if not task_details:
         print("Failed to extract task details.")
-        return
+        return None
 
     print("\nExtracted Task Details:")
-    print(json.dumps(task_details, indent=2))
+    print(format_json(task_details))
+
+    if not interactive:
+        return task_details
 
     # Step 3: Ask follow-up questions for more details
     task_details = ask_follow_up_questions(task_details)
 
     print("\nFinal Task Details:")
-    print(json.dumps(task_details, indent=2))
+    print(format_json(task_details))
+    return task_details
+
+def main(audio_file_paths, use_cache=True, speedup=None, interactive=True):
+    # Step 1: Transcribe all audio files. Steps 2-3 run on each transcript as soon
+    # as it is ready: extract task details and ask follow-up questions
+    task_details_list = []
+    transcripts = iter_transcripts(audio_file_paths, use_cache=use_cache, speedup=speedup)
+    for audio_file_path, transcript_text in transcripts:
+        if not transcript_text:
+            print(f"Failed to transcribe audio: {audio_file_path}")
+            continue
+        task_details = process_transcript(transcript_text, interactive=interactive)
+        if task_details:
+            task_details_list.append(task_details)
+
+    if not task_details_list:
+        return
 
-    # Step 4: Authenticate with Google Calendar
-    service = authenticate_google_calendar()
+    # Step 4: Authenticate with Google Calendar (once per run)
+    client = get_calendar_client()
 
-    # Step 5: Add event to calendar with detailed information
-    create_calendar_event(service, task_details)
+    # Step 5: Add all events to calendar with detailed information
+    add_events_to_calendar(client, task_details_list)
 
     # Step 6: Display updated schedule
-    display_upcoming_events(service)
+    display_upcoming_events(client)
 
 if __name__ == "__main__":
-    # Example Usage
-    # Replace 'audio.wav' with the actual path to your local audio file
-    audio_file_path = "audio.wav"
-    main(audio_file_path)
+    parser = argparse.ArgumentParser(description="Turn spoken requests into Google Calendar events.")
+    # Example Usage: python main.py audio.wav other.wav
+    parser.add_argument("audio_files", nargs="*", default=["audio.wav"],
+                        help="Paths to local audio files (default: audio.wav)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Always send audio to AssemblyAI instead of reusing cached transcripts")
+    parser.add_argument("--speedup", action="store_const", const=SPEEDUP_FACTOR,
+                        help=f"Speed audio up {SPEEDUP_FACTOR}x with ffmpeg before uploading to cut "
+                             "transcription time and cost, at a small cost in accuracy")
+    parser.add_argument("--batch", action="store_true",
+                        help="Run unattended: skip the follow-up questions and use only the details "
+                             "extracted from each transcript")
+    args = parser.parse_args()
+    main(args.audio_files, use_cache=not args.no_cache, speedup=args.speedup, interactive=not args.batch)
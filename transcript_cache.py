@@ -0,0 +1,62 @@
+import os
+import json
+import hashlib
+import tempfile
+try:
+    import orjson  # Faster JSON parsing/serialization, used when installed
+except ImportError:
+    orjson = None
+
+# Bump this whenever the transcription settings change so stale entries are ignored
+CACHE_VERSION = "v1"
+CACHE_DIR = ".transcript_cache"
+
+def file_sha256(file_path, chunk_size=1024 * 1024):
+    """
+    Returns the SHA-256 hex digest of a file's contents.
+    """
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def make_key(audio_file_path, speedup=None):
+    """
+    Builds the cache key for an audio file from its contents, not its name.
+    Sped-up audio gets its own key, since it is transcribed from different input.
+    """
+    key = f"{CACHE_VERSION}-{file_sha256(audio_file_path)}"
+    return f"{key}-x{speedup}" if speedup else key
+
+def entry_path(key, extension='.json'):
+    """
+    Returns the path of the cache file stored under the key.
+    """
+    return os.path.join(CACHE_DIR, f"{key}{extension}")
+
+def get(key):
+    """
+    Returns the cached value for the key, or None if there is no usable entry.
+    """
+    try:
+        with open(entry_path(key), 'rb') as f:
+            data = f.read()
+        return orjson.loads(data) if orjson else json.loads(data)
+    except (OSError, ValueError):
+        return None
+
+def put(key, value):
+    """
+    Stores a JSON-serializable value under the key.
+    """
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    # Write to a temporary file first so a crash never leaves a half-written entry
+    fd, tmp_path = tempfile.mkstemp(dir=CACHE_DIR, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(orjson.dumps(value) if orjson else json.dumps(value).encode('utf-8'))
+        os.replace(tmp_path, entry_path(key))
+    except BaseException:
+        os.remove(tmp_path)
+        raise